@@ -1,339 +1,677 @@
 
 import os
-import json
+import hashlib
+import itertools
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
-
+import sqlite3
+import sys
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import operator
+from typing import Annotated, Callable, Dict, Iterator, List, Any, Literal, Optional, Tuple
+
+import orjson
+from google.api_core import exceptions as google_exceptions
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.utils.json import parse_partial_json
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, END
+from langgraph.types import Command
+from pydantic import BaseModel
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential
+)
 from typing_extensions import TypedDict
 
-# Configure logging to file (no console output)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('debate_log.txt')
-    ]
-)
+# Handlers are configured by the entry point (main.py)
 logger = logging.getLogger(__name__)
 
-@dataclass
-class Argument:
+# Prompt templates. The *_PROMPT prefixes are static per (role, topic) and sent
+# as the system message; the *_TURN_PROMPT suffixes carry the per-call data.
+_SCI_PROMPT = """You are a Scientist participating in a structured debate.
+
+Topic: {topic}
+
+As a Scientist, base your argument on:
+- Empirical evidence and data
+- Scientific methodology
+- Risk assessment and safety protocols
+- Peer-reviewed research
+- Quantifiable impacts
+
+Make a compelling, evidence-based argument (2-3 sentences). Be persuasive but factual."""
+
+_PHIL_PROMPT = """You are a Philosopher participating in a structured debate.
+
+Topic: {topic}
+
+As a Philosopher, base your argument on:
+- Ethical considerations and moral frameworks
+- Historical precedents and lessons
+- Conceptual analysis and definitions
+- Social and cultural implications
+- Individual rights and freedoms
+- Long-term societal impact
+
+Make a compelling, philosophically grounded argument (2-3 sentences). Be persuasive and thoughtful."""
+
+_AGENT_TURN_PROMPT = """Current Memory Summary: {memory_summary}
+
+Recent Arguments:
+{previous_args}
+
+This is Round {round} of 8. You are making your {turn} argument."""
+
+_MEM_PROMPT = """Update the debate memory summary with the latest arguments.
+
+Current Topic: {topic}
+
+Provide an updated summary that captures:
+1. The main debate topic
+2. Key points from both sides
+3. Current trajectory of the debate
+4. Notable patterns or themes
+
+Keep it concise (3-4 sentences)."""
+
+_MEM_TURN_PROMPT = """Previous Summary: {memory_summary}
+
+Recent Arguments:
+{recent_args}"""
+
+_JUDGE_PROMPT = """You are an impartial judge evaluating a structured debate.
+
+Topic: {topic}"""
+
+# The debate material comes first, then the rubric and the requested fields
+_JUDGE_TURN_PROMPT = """Full Debate Transcript:
+{transcript}
+
+Memory Summary: {memory_summary}
+
+As the judge, evaluate the debate based on:
+1. Logical coherence and consistency
+2. Quality and relevance of evidence
+3. Persuasiveness of arguments
+4. Addressing counterpoints
+5. Overall strength of position
+
+Provide:
+- summary: a comprehensive summary of the debate (3-4 sentences)
+- winner: either "Scientist" or "Philosopher"
+- reason: detailed reasoning for your decision (2-3 sentences)"""
+
+# System prefix template for each role
+_PREFIX_PROMPTS = {
+    "Scientist": _SCI_PROMPT,
+    "Philosopher": _PHIL_PROMPT,
+    "Memory": _MEM_PROMPT,
+    "Judge": _JUDGE_PROMPT
+}
+
+# Gemini JSON mode config for the agents; mirrors AgentArgument. Plain text
+# answers sometimes came back wrapped in markdown
+_AGENT_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type_": "OBJECT",
+        "properties": {
+            "argument": {"type_": "STRING"}
+        },
+        "required": ["argument"]
+    }
+}
+
+# Gemini JSON mode config for the judge; mirrors JudgeResult
+_JUDGE_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type_": "OBJECT",
+        "properties": {
+            "summary": {"type_": "STRING"},
+            "winner": {"type_": "STRING", "format_": "enum", "enum": ["Scientist", "Philosopher"]},
+            "reason": {"type_": "STRING"}
+        },
+        "required": ["summary", "winner", "reason"],
+        "property_ordering": ["summary", "winner", "reason"]
+    }
+}
+
+# Rate limits and overload are usually gone within seconds; retrying here keeps
+# a single 429/503 from aborting a debate. Other errors are not retried. The
+# client already makes two quick attempts per call (not configurable), so one
+# more attempt after a longer pause caps a call at four requests
+_retry_transient = retry(
+    reraise=True,
+    stop=stop_after_attempt(2),
+    wait=wait_exponential(multiplier=2, min=4, max=16),
+    retry=retry_if_exception_type(
+        (google_exceptions.ResourceExhausted, google_exceptions.ServiceUnavailable)
+    ),
+    before_sleep=before_sleep_log(logger, logging.WARNING)
+)
+
+# Seconds a single request may take before it fails; the chat model ignores its
+# own timeout setting, so this is passed on every call
+_LLM_TIMEOUT = 60
+
+def _require_text(content: str):
+    """Reject an empty model response (blocked or cut off)"""
+    if not content.strip():
+        raise ValueError("Empty LLM response")
+
+def _iso_now() -> str:
+    """Current UTC time as a compact ISO-8601 string (second precision)"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+class Argument(TypedDict):
     """Represents a single argument in the debate"""
     agent: str
     round_num: int
     content: str
     timestamp: str
 
-class DebateState(TypedDict):
+def _format_arguments(arguments: List[Argument]) -> str:
+    """Render arguments as '[Round N] Agent: content' lines"""
+    return "\n".join(
+        f"[Round {arg['round_num']}] {arg['agent']}: {arg['content']}" for arg in arguments
+    )
+
+class AgentArgument(BaseModel):
+    """Structured argument returned by an agent"""
+    argument: str
+
+class JudgeResult(BaseModel):
+    """Structured verdict returned by the judge"""
+    summary: str
+    winner: Literal["Scientist", "Philosopher"]
+    reason: str
+
+@dataclass(slots=True)
+class DebateState:
     """State structure for the debate workflow"""
-    topic: str
-    current_round: int
-    current_agent: str
-    arguments: List[Dict[str, Any]]
-    memory_summary: str
-    debate_complete: bool
-    winner: Optional[str]
-    judgment_reason: Optional[str]
-    full_summary: Optional[str]
+    # Keys per-debate bookkeeping held outside the graph (pending memory updates)
+    debate_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Console output (streaming, banners, verdict); off for batch runs
+    verbose: bool = True
+    topic: str = ""
+    current_round: int = 1
+    # Plain dicts: serialized by orjson and sliced for prompts without copying.
+    # Nodes return only their new arguments; the reducer appends them
+    arguments: Annotated[List[Argument], operator.add] = field(default_factory=list)
+    memory_summary: str = ""
+    debate_complete: bool = False
+    winner: Optional[str] = None
+    judgment_reason: Optional[str] = None
+    full_summary: Optional[str] = None
+
+class LLMCache:
+    """Persistent LLM response cache keyed by a hash of the model and prompt"""
+
+    def __init__(self, path: str = '.llm_cache'):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        conn = sqlite3.connect(self.path)
+        try:
+            # WAL is stored in the file: readers never block on the worker
+            # threads' writes, and a write appends to the log instead of
+            # rewriting pages through a rollback journal
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Any], config: Dict[str, Any]) -> str:
+        """Hash the model name, generation config and role-tagged prompt into a cache key"""
+        payload = {
+            "model": model,
+            "config": config,
+            "prompt": [[m.type, m.content] for m in messages]
+        }
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, if any"""
+        # A connection per operation keeps the cache safe to use from worker threads
+        conn = sqlite3.connect(self.path)
+        try:
+            row = conn.execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, content: str):
+        """Store a response under a key"""
+        conn = sqlite3.connect(self.path)
+        try:
+            # Under WAL this only gives up durability of the latest writes on
+            # power loss, which a cache can afford
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)", (key, content))
+            conn.commit()
+        finally:
+            conn.close()
 
 class DebateSystem:
-    def __init__(self, api_key: str):
-        """Initialize the debate system with Gemini API"""
+    def __init__(self, api_key: str, use_cache: bool = True):
+        """Initialize the debate system with Gemini API
+
+        With use_cache, responses are stored in '.llm_cache' and an identical
+        prompt is answered from there, so rerunning a topic replays its debate.
+        """
+        # One client is shared by every node (and the memory worker), so all
+        # calls reuse a single long-lived HTTP/2 gRPC channel
         self.llm = ChatGoogleGenerativeAI(
             model="gemini-2.0-flash",
             google_api_key=api_key,
-            temperature=0.7
+            temperature=0.7,
+            transport="grpc"
         )
+        # Static system prefixes per (role, topic), rendered once per topic
+        # instead of on every call
+        self._prefixes: Dict[tuple, SystemMessage] = {}
+        # Memory updates run on background workers so they overlap with the
+        # next round's LLM calls; each debate has at most one in flight, which
+        # keeps its summaries in order
+        self._memory_executor = ThreadPoolExecutor(max_workers=4)
+        # debate_id -> (future, arguments it summarizes)
+        self._pending_memory: Dict[str, Tuple[Future, List[Argument]]] = {}
+        # debate_id -> transcript path, for debates resumed from a given file
+        self._transcripts: Dict[str, str] = {}
+        # Runs the second agent of each round alongside the first
+        self._agent_executor = ThreadPoolExecutor(max_workers=4)
+        # Identical prompts (persona + topic + context) are served from disk
+        self._cache: Optional[LLMCache] = LLMCache('.llm_cache') if use_cache else None
         self.graph = None
         self.build_graph()
+        
+        # Prime the connection while the user is still typing the topic
+        threading.Thread(target=self._warmup, daemon=True).start()
+
+    def _warmup(self):
+        """Open the gRPC channel and authenticate ahead of the first real call"""
+        try:
+            # count_tokens is free and goes over the same channel as generation
+            self.llm.get_num_tokens("warmup")
+            logger.info("LLM client warmed up")
+        except Exception as e:
+            logger.warning("LLM warmup failed: %s", e)
+
+    def _build_prefixes(self, topic: str):
+        """Render every role's static prompt prefix for a topic, once"""
+        for role, template in _PREFIX_PROMPTS.items():
+            key = (role, topic)
+            if key not in self._prefixes:
+                self._prefixes[key] = SystemMessage(content=template.format(topic=topic))
+
+    def _get_prefix(self, role: str, topic: str) -> SystemMessage:
+        """Return the prebuilt static prompt prefix for a role and topic"""
+        key = (role, topic)
+        if key not in self._prefixes:
+            self._build_prefixes(topic)
+        return self._prefixes[key]
+
+    def _invoke_cached(self, messages: List[Any], generation_config: Optional[Dict[str, Any]] = None,
+                       stream: Optional[Callable[[List[Any], Dict[str, Any]], str]] = None,
+                       validate: Callable[[str], Any] = _require_text) -> str:
+        """Invoke the model at temperature 0, reusing a cached response when available
+
+        Only responses that pass validate are cached, so a truncated or blocked
+        reply is retried on the next run instead of being replayed forever.
+        """
+        config = {"temperature": 0.0, **(generation_config or {})}
+        key = LLMCache.make_key(self.llm.model, messages, config)
+        cached = self._cache.get(key) if self._cache else None
+        if cached is not None:
+            try:
+                validate(cached)
+                logger.info("LLM cache hit")
+                return cached
+            except ValueError:
+                # Written before responses were validated; fetch a fresh one
+                logger.warning("Ignoring invalid cached LLM response")
+        
+        # Same client as the agents, so the call reuses the shared channel
+        if stream is not None:
+            content = stream(messages, config)
+        else:
+            content = self._invoke_llm(messages, config).strip()
+        validate(content)
+        if self._cache:
+            self._cache.set(key, content)
+        return content
+
+    def _agent_argument(self, messages: List[Any], stream_indent: Optional[str] = None) -> str:
+        """Generate an agent argument, reusing the cached one for an identical prompt"""
+        # Keyed on the full prompt, so a hit means same persona, topic and context
+        config = {"temperature": self.llm.temperature, **_AGENT_GENERATION_CONFIG}
+        key = LLMCache.make_key(self.llm.model, messages, config)
+        cached = self._cache.get(key) if self._cache else None
+        if cached is not None:
+            logger.info("LLM cache hit")
+            if stream_indent is not None:
+                print(f"{stream_indent}{cached}\n")
+            return cached
+        
+        if stream_indent is not None:
+            response = self._stream_json_field(messages, config, "argument", indent=stream_indent)
+            print()
+        else:
+            response = self._invoke_llm(messages, config)
+        
+        # Only the argument text is cached, ready for the console and the state
+        content = AgentArgument.model_validate_json(response).argument.strip()
+        if self._cache:
+            self._cache.set(key, content)
+        return content
+
+    @_retry_transient
+    def _invoke_llm(self, messages: List[Any], generation_config: Dict[str, Any]) -> str:
+        """Run one non-streaming model call and return the response text"""
+        return self.llm.invoke(messages, generation_config=generation_config, timeout=_LLM_TIMEOUT).content
+
+    @_retry_transient
+    def _open_stream(self, messages: List[Any], generation_config: Dict[str, Any]) -> Iterator[Any]:
+        """Start a streaming call and return its chunks, first one included"""
+        stream = self.llm.stream(messages, generation_config=generation_config, timeout=_LLM_TIMEOUT)
+        # The request is only sent on the first next(); failures up to here have
+        # shown nothing yet, so they are the only ones safe to retry
+        first = next(stream, None)
+        return stream if first is None else itertools.chain([first], stream)
+
+    def _stream_json_field(self, messages: List[Any], generation_config: Dict[str, Any],
+                           field_name: str, indent: str = "") -> str:
+        """Stream a JSON-mode response, printing one string field as its tokens arrive
+
+        Returns the full JSON text.
+        """
+        parts = []
+        printed = 0
+        chunks = self._open_stream(messages, generation_config)
+        print(indent, end="", flush=True)
+        for chunk in chunks:
+            parts.append(chunk.content)
+            partial = parse_partial_json("".join(parts))
+            text = partial.get(field_name, "") if isinstance(partial, dict) else ""
+            if len(text) > printed:
+                print(text[printed:], end="", flush=True)
+                printed = len(text)
+        print()
+        return "".join(parts).strip()
+
+    def _collect_memory(self, state: DebateState) -> Dict[str, Any]:
+        """Fold the pending background memory update, if any, into the state
+
+        Returns the memory fields as a node update.
+        """
+        # Only the graph thread writes the summary and a debate has at most one
+        # update in flight, so the pending one is always based on the current
+        # summary and can be applied as is
+        if state.debate_id in self._pending_memory:
+            future, recent_args = self._pending_memory.pop(state.debate_id)
+            state.memory_summary = future.result()
+            # round_num marks how far the summary reaches, for resuming
+            self._append_transcript(state, {
+                "type": "memory",
+                "summary": state.memory_summary,
+                "round_num": recent_args[-1]["round_num"]
+            })
+        
+        return {"memory_summary": state.memory_summary}
+
+    def _submit_memory(self, state: DebateState, recent_args: List[Argument]):
+        """Start a background summary update on top of the current summary"""
+        prefix = self._get_prefix("Memory", state.topic)
+        summary_prompt = _MEM_TURN_PROMPT.format(
+            memory_summary=state.memory_summary,
+            recent_args=_format_arguments(recent_args)
+        )
+        
+        future = self._memory_executor.submit(
+            self._update_memory,
+            [prefix, HumanMessage(content=summary_prompt)],
+            state.memory_summary
+        )
+        self._pending_memory[state.debate_id] = (future, recent_args)
     
-    def user_input_node(self, state: DebateState) -> DebateState:
+    def transcript_path(self, state: DebateState) -> str:
+        """Path of the debate's incremental JSONL transcript"""
+        # A resumed debate keeps writing to the file it was resumed from
+        return self._transcripts.get(state.debate_id, f"debate_{state.debate_id}.jsonl")
+
+    def _append_transcript(self, state: DebateState, record: Dict[str, Any]):
+        """Append one record to the debate's JSONL transcript as soon as it exists"""
+        # Opened per record so every line is on disk before the debate moves on
+        with open(self.transcript_path(state), 'ab') as f:
+            f.write(orjson.dumps(record) + b"\n")
+
+    def user_input_node(self, state: DebateState) -> Dict[str, Any]:
         """Node to handle user input for debate topic"""
         logger.info("=== USER INPUT NODE ===")
         
-        if not state.get("topic"):
-            topic = input("Enter topic for debate: ").strip()
-            state["topic"] = topic
-            state["current_round"] = 1
-            state["current_agent"] = "Scientist"
-            state["arguments"] = []
-            state["memory_summary"] = f"Debate Topic: {topic}"
-            state["debate_complete"] = False
-            
+        # Only fall back to prompting when a person is there to answer
+        if not state.topic:
+            if not sys.stdin.isatty():
+                raise ValueError("No debate topic given and stdin is not interactive")
+            state.topic = input("Enter topic for debate: ").strip()
+        
+        # Every role's prefix is fixed from here on; render them before the rounds
+        self._build_prefixes(state.topic)
+        
+        # A resumed debate keeps the progress loaded from its transcript
+        if not state.arguments:
+            state.current_round = 1
+            state.memory_summary = f"Debate Topic: {state.topic}"
+            state.debate_complete = False
+            self._append_transcript(state, {
+                "type": "topic",
+                "debate_id": state.debate_id,
+                "topic": state.topic,
+                "timestamp": _iso_now()
+            })
+        
+        if state.verbose:
             print(f"\n{'='*60}")
             print(f"🎭 DEBATE: Scientist vs Philosopher")
-            print(f"📋 Topic: {topic}")
+            print(f"📋 Topic: {state.topic}")
             print(f"{'='*60}\n")
         
-        return state
+        return {
+            "topic": state.topic,
+            "current_round": state.current_round,
+            "memory_summary": state.memory_summary,
+            "debate_complete": state.debate_complete
+        }
     
-    def scientist_agent_node(self, state: DebateState) -> DebateState:
-        """Scientist agent node - evidence-based arguments"""
-        logger.info(f"=== SCIENTIST AGENT NODE - Round {state['current_round']} ===")
-
-        # Prepare context
-        previous_args = "\n".join([
-            f"[Round {arg['round_num']}] {arg['agent']}: {arg['content']}" 
-            for arg in state["arguments"]
-        ])
-        
-        prompt = f"""You are a Scientist participating in a structured debate.
-        
-Topic: {state['topic']}
+    def _agent_messages(self, agent: str, state: DebateState, round_num: int) -> List[Any]:
+        """Build the prompt messages for one agent's argument"""
+        # Only the most recent arguments are sent verbatim; the memory summary
+        # covers older rounds
+        prompt = _AGENT_TURN_PROMPT.format(
+            memory_summary=state.memory_summary,
+            previous_args=_format_arguments(state.arguments[-2:]),
+            round=round_num,
+            turn=(round_num + 1) // 2
+        )
+        return [self._get_prefix(agent, state.topic), HumanMessage(content=prompt)]
 
-Current Memory Summary: {state['memory_summary']}
+    def round_node(self, state: DebateState) -> Command[Literal["round", "judge"]]:
+        """Round node - Scientist and Philosopher argue concurrently from the same context
 
-Previous Arguments:
-{previous_args}
+        Also starts the memory update for the round and loops back to itself
+        until the debate is complete.
+        """
+        logger.info("=== ROUND NODE - Rounds %s-%s ===", state.current_round, state.current_round + 1)
 
-This is Round {state['current_round']} of 8. You are making your {(state['current_round'] + 1) // 2} argument.
+        # The summary in state covers every round but the previous one, whose
+        # update is still running; both agents always see exactly that, so a
+        # round's prompts never depend on how fast the background call was
+        update: Dict[str, Any] = {}
 
-As a Scientist, base your argument on:
-- Empirical evidence and data
-- Scientific methodology
-- Risk assessment and safety protocols
-- Peer-reviewed research
-- Quantifiable impacts
-
-Make a compelling, evidence-based argument (2-3 sentences). Be persuasive but factual."""
+        sci_round = state.current_round
+        phil_round = state.current_round + 1
+        sci_messages = self._agent_messages("Scientist", state, sci_round)
+        phil_messages = self._agent_messages("Philosopher", state, phil_round)
 
         try:
-            response = self.llm.invoke(prompt)
-            argument_content = response.content.strip()
+            # The Philosopher no longer waits for the Scientist's argument, so
+            # its call runs in the background while the Scientist streams
+            phil_future = self._agent_executor.submit(self._agent_argument, phil_messages)
             
-            # Create argument record
-            argument = Argument(
-                agent="Scientist",
-                round_num=state["current_round"],
-                content=argument_content,
-                timestamp=datetime.now().isoformat()
-            )
+            if state.verbose:
+                print(f"🔬[Round {sci_round}] Scientist:")
+            sci_content = self._agent_argument(sci_messages, stream_indent="    " if state.verbose else None)
             
-            # Update state
-            state["arguments"].append(asdict(argument))
-
-            # log and Display argument
-            logger.info(f"Scientist argument: {argument_content}")
-            print(f"🔬[Round {state['current_round']}] Scientist:")
-            print(f"    {argument_content}\n")
-            
-            # Update for next turn
-            state["current_round"] += 1
-            state["current_agent"] = "Philosopher"
+            phil_content = phil_future.result()
+            if state.verbose:
+                print(f"🤔 [Round {phil_round}] Philosopher:")
+                print(f"   {phil_content}\n")
             
         except Exception as e:
-            logger.error(f"Error in scientist agent: {e}")
-            # print(f"Error in scientist agent: {e}")
+            logger.error("Error in round node: %s", e)
+            # print(f"Error in round node: {e}")
             raise
         
-        return state
-    
-    def philosopher_agent_node(self, state: DebateState) -> DebateState:
-        """Philosopher agent node - conceptual and ethical arguments"""
-        logger.info(f"=== PHILOSOPHER AGENT NODE - Round {state['current_round']} ===")
-        
-        # Prepare context
-        previous_args = "\n".join([
-            f"[Round {arg['round_num']}] {arg['agent']}: {arg['content']}" 
-            for arg in state["arguments"]
-        ])
-        
-        prompt = f"""You are a Philosopher participating in a structured debate.
-        
-Topic: {state['topic']}
-
-Current Memory Summary: {state['memory_summary']}
-
-Previous Arguments:
-{previous_args}
-
-This is Round {state['current_round']} of 8. You are making your {state['current_round'] // 2} argument.
-
-As a Philosopher, base your argument on:
-- Ethical considerations and moral frameworks
-- Historical precedents and lessons
-- Conceptual analysis and definitions
-- Social and cultural implications
-- Individual rights and freedoms
-- Long-term societal impact
-
-Make a compelling, philosophically grounded argument (2-3 sentences). Be persuasive and thoughtful."""
-
-        try:
-            response = self.llm.invoke(prompt)
-            argument_content = response.content.strip()
-            
-            # Create argument record
+        # Create argument records (plain dicts, ready for JSON) in debate order
+        new_arguments = []
+        for agent, round_num, content in (
+            ("Scientist", sci_round, sci_content),
+            ("Philosopher", phil_round, phil_content)
+        ):
             argument = Argument(
-                agent="Philosopher",
-                round_num=state["current_round"],
-                content=argument_content,
-                timestamp=datetime.now().isoformat()
+                agent=agent,
+                round_num=round_num,
+                content=content,
+                timestamp=_iso_now()
             )
-            
-            # Update state
-            state["arguments"].append(asdict(argument))
-            
-            # Log and display
-            logger.info(f"Philosopher argument: {argument_content}")
-            print(f"🤔 [Round {state['current_round']}] Philosopher:")
-            print(f"   {argument_content}\n")
-            
-            # Update for next turn
-            if state["current_round"] < 8:
-                state["current_round"] += 1
-                state["current_agent"] = "Scientist"
-            else:
-                state["debate_complete"] = True
-                state["current_agent"] = "Judge"
-            
-        except Exception as e:
-            logger.error(f"Error in philosopher agent: {e}")
-            # print(f"Error in philosopher agent: {e}")
-            raise
+            new_arguments.append(argument)
+            self._append_transcript(state, {"type": "argument", **argument})
+            logger.info("%s argument: %s", agent, content)
         
-        return state
-    
-    def memory_node(self, state: DebateState) -> DebateState:
-        """Node to update and maintain debate memory"""
-        logger.info("=== MEMORY NODE ===")
+        update["arguments"] = new_arguments
         
-        if not state["arguments"]:
-            return state
+        # The judge reads the transcript directly, so the final round needs no summary
+        if phil_round >= 8:
+            update["debate_complete"] = True
+            return Command(update=update, goto="judge")
         
-        # Create structured summary of recent arguments
-        recent_args = state["arguments"][-2:] if len(state["arguments"]) >= 2 else state["arguments"]
+        # Each summary builds on the previous one, so finish that first (it ran
+        # alongside this round's agents), then summarize this round in the
+        # background; it is collected at the end of the next round or by the judge
+        update.update(self._collect_memory(state))
+        self._submit_memory(state, new_arguments)
         
-        summary_prompt = f"""Update the debate memory summary with the latest arguments.
-
-Current Topic: {state['topic']}
-
-Previous Summary: {state['memory_summary']}
-
-Recent Arguments:
-{chr(10).join([f"[Round {arg['round_num']}] {arg['agent']}: {arg['content']}" for arg in recent_args])}
-
-Provide an updated summary that captures:
-1. The main debate topic
-2. Key points from both sides
-3. Current trajectory of the debate
-4. Notable patterns or themes
-
-Keep it concise (3-4 sentences)."""
-
+        # Update for next round
+        update["current_round"] = phil_round + 1
+        return Command(update=update, goto="round")
+    
+    def _update_memory(self, messages: List[Any], previous_summary: str) -> str:
+        """Run the memory summarization call and return the new summary"""
         try:
-            response = self.llm.invoke(summary_prompt)
-            updated_summary = response.content.strip()
-            state["memory_summary"] = updated_summary
+            updated_summary = self._invoke_cached(messages)
             
-            logger.info(f"Memory updated: {updated_summary}")
+            logger.info("Memory updated: %s", updated_summary)
+            return updated_summary
             
         except Exception as e:
-            logger.error(f"Error updating memory: {e}")
-        
-        return state
+            logger.error("Error updating memory: %s", e)
+            return previous_summary
     
-    def judge_node(self, state: DebateState) -> DebateState:
+    def judge_node(self, state: DebateState) -> Dict[str, Any]:
         """Judge node to evaluate the debate and declare winner"""
         logger.info("=== JUDGE NODE ===")
         
+        # The judge reads the final memory summary
+        update = self._collect_memory(state)
+        
         # Prepare full debate transcript
-        full_transcript = "\n".join([
-            f"[Round {arg['round_num']}] {arg['agent']}: {arg['content']}" 
-            for arg in state["arguments"]
-        ])
+        full_transcript = _format_arguments(state.arguments)
         
-        judgment_prompt = f"""You are an impartial judge evaluating a structured debate.
-
-Topic: {state['topic']}
-
-Full Debate Transcript:
-{full_transcript}
-
-Memory Summary: {state['memory_summary']}
-
-As the judge, evaluate the debate based on:
-1. Logical coherence and consistency
-2. Quality and relevance of evidence
-3. Persuasiveness of arguments
-4. Addressing counterpoints
-5. Overall strength of position
-
-Provide:
-1. A comprehensive summary of the debate (3-4 sentences)
-2. The winner (either "Scientist" or "Philosopher")
-3. Detailed reasoning for your decision (2-3 sentences)
-
-Format your response as:
-SUMMARY: [your summary]
-WINNER: [Scientist or Philosopher]
-REASON: [your reasoning]"""
+        prefix = self._get_prefix("Judge", state.topic)
+        judgment_prompt = _JUDGE_TURN_PROMPT.format(
+            transcript=full_transcript,
+            memory_summary=state.memory_summary
+        )
 
+        streamed = False
+        
+        def stream_judgment(messages: List[Any], generation_config: Dict[str, Any]) -> str:
+            nonlocal streamed
+            streamed = True
+            # The schema orders the summary first, so it is readable long
+            # before the winner and reason are decoded
+            return self._stream_json_field(messages, generation_config, "summary")
+        
         try:
-            response = self.llm.invoke(judgment_prompt)
-            judgment = response.content.strip()
+            if state.verbose:
+                print(f"{'='*60}")
+                print(f"\n[Judge] Summary of debate:")
+                print(f"{'='*60}")
             
-            # Parse judgment
-            lines = judgment.split('\n')
-            summary_line = next((line for line in lines if line.startswith('SUMMARY:')), '')
-            winner_line = next((line for line in lines if line.startswith('WINNER:')), '')
-            reason_line = next((line for line in lines if line.startswith('REASON:')), '')
+            judgment = self._invoke_cached(
+                [prefix, HumanMessage(content=judgment_prompt)],
+                generation_config=_JUDGE_GENERATION_CONFIG,
+                stream=stream_judgment if state.verbose else None,
+                validate=JudgeResult.model_validate_json
+            )
             
-            state["full_summary"] = summary_line.replace('SUMMARY:', '').strip()
-            state["winner"] = winner_line.replace('WINNER:', '').strip()
-            state["judgment_reason"] = reason_line.replace('REASON:', '').strip()
+            # The response is schema-constrained JSON
+            result = JudgeResult.model_validate_json(judgment)
+            state.full_summary = result.summary
+            state.winner = result.winner
+            state.judgment_reason = result.reason
+            self._append_transcript(state, {"type": "judgment", **result.model_dump()})
             
             # Log judgment
-            logger.info(f"Judgment complete - Winner: {state['winner']}")
-            logger.info(f"Summary: {state['full_summary']}")
-            logger.info(f"Reason: {state['judgment_reason']}")
-
-            # Display results
-            print(f"{'='*60}")
-            print(f"\n[Judge] Summary of debate:")
-            print(f"{'='*60}")
-            print(f"{state['full_summary']}")
-            print(f"\n[Judge] Winner: {state['winner']}")
-            print(f"Reason: {state['judgment_reason']}")
-            print(f"{'='*60}")
+            logger.info("Judgment complete - Winner: %s", state.winner)
+            logger.info("Summary: %s", state.full_summary)
+            logger.info("Reason: %s", state.judgment_reason)
+
+            # Display results; a fresh summary has already been streamed
+            if state.verbose:
+                if not streamed:
+                    print(f"{state.full_summary}")
+                print(f"\n[Judge] Winner: {state.winner}")
+                print(f"Reason: {state.judgment_reason}")
+                print(f"{'='*60}")
             
         except Exception as e:
-            logger.error(f"Error in judge node: {e}")
+            logger.error("Error in judge node: %s", e)
             # print(f"Error in judge node: {e}")
-            state["winner"] = "Error in judgment"
-            state["judgment_reason"] = "Could not complete evaluation"
+            state.winner = "Error in judgment"
+            state.judgment_reason = "Could not complete evaluation"
         
-        return state
+        return {
+            **update,
+            "winner": state.winner,
+            "judgment_reason": state.judgment_reason,
+            "full_summary": state.full_summary
+        }
     
+    # Routers only read the state; all LLM work happens inside nodes
     def route_after_input(self, state: DebateState) -> str:
-        """Route after user input - always go to scientist first"""
-        return "scientist"
-    
-    def route_after_scientist(self, state: DebateState) -> str:
-        """Route after scientist argument"""
-        return "memory"
-    
-    def route_after_philosopher(self, state: DebateState) -> str:
-        """Route after philosopher argument"""
-        if state["debate_complete"]:
-            return "judge"
-        else:
-            return "memory"
-        
-    def route_after_memory(self, state: DebateState) -> str:
-        """Route after memory update"""
-        if state["debate_complete"]:
+        """Route after user input - a resumed debate may only need judging"""
+        if state.debate_complete:
             return "judge"
-        elif state["current_agent"] == "Scientist":
-            return "scientist"
-        elif state["current_agent"] == "Philosopher":
-            return "philosopher"
         else:
-            return "judge"
+            return "round"
     
     def build_graph(self):
         """Build the LangGraph workflow"""
@@ -341,42 +679,19 @@ REASON: [your reasoning]"""
         
         # Add nodes
         workflow.add_node("user_input", self.user_input_node)
-        workflow.add_node("scientist", self.scientist_agent_node)
-        workflow.add_node("philosopher", self.philosopher_agent_node)
-        workflow.add_node("memory", self.memory_node)
+        workflow.add_node("round", self.round_node)
         workflow.add_node("judge", self.judge_node)
         
         # Add edges
         workflow.set_entry_point("user_input")
 
-        # add conditional edges based on routing logic
+        # add conditional edges based on routing logic; the round node picks
+        # its own successor
         workflow.add_conditional_edges(
             "user_input",
             self.route_after_input,
-            {"scientist": "scientist"}
-        )
-        
-        workflow.add_conditional_edges(
-            "scientist",
-            self.route_after_scientist,
-            {"memory": "memory"}
-        )
-        
-        workflow.add_conditional_edges(
-            "philosopher",
-            self.route_after_philosopher,
             {
-                "memory": "memory",
-                "judge": "judge"
-            }
-        )
-
-        workflow.add_conditional_edges(
-            "memory",
-            self.route_after_memory,
-            {
-                "scientist": "scientist",
-                "philosopher": "philosopher",
+                "round": "round",
                 "judge": "judge"
             }
         )
@@ -387,66 +702,165 @@ REASON: [your reasoning]"""
 
     def show_workflow_diagram(self):
         """Display the workflow DAG diagram and save as image"""
+        # Only called on request (--draw-dag): rendering goes over the network
+        # to mermaid.ink, so it always re-renders rather than trust a stale file
+        diagram_path = 'debate_workflow.png'
+        
         try:
             # Save the diagram as PNG file
             diagram_data = self.graph.get_graph().draw_mermaid_png()
             
             # Save to file
-            with open('debate_workflow.png', 'wb') as f:
+            with open(diagram_path, 'wb') as f:
                 f.write(diagram_data)
             
-            print("🔄 Workflow DAG Diagram saved as 'debate_workflow.png'")
+            print(f"🔄 Workflow DAG Diagram saved as '{diagram_path}'")
             print("=" * 50)
         except Exception as e:
             print(f"Could not generate diagram: {e}")
-            print("📊 Workflow: user_input → scientist → memory → philosopher → memory → ... → judge → END")
+            print("📊 Workflow: user_input → round → round → ... → judge → END")
 
-    def run_debate(self) -> DebateState:
-        """Execute the debate workflow"""
+    def run_debate(self, topic: Optional[str] = None) -> DebateState:
+        """Execute the debate workflow, prompting for the topic if none is given"""
         logger.info("Starting debate system...")
-
-        # Show workflow diagram
-        self.show_workflow_diagram()
-        print("\n")
-        
-        initial_state = DebateState(
-            topic="",
-            current_round=1,
-            current_agent="Scientist",
-            arguments=[],
-            memory_summary="",
-            debate_complete=False,
-            winner=None,
-            judgment_reason=None,
-            full_summary=None
-        )
+        return self._execute(DebateState(topic=topic or ""))
+    
+    def resume_debate(self, path: str) -> DebateState:
+        """Continue a debate from its JSONL transcript, skipping completed rounds"""
+        logger.info("Resuming debate from %s...", path)
+        
+        # Offset just past each complete line, with its record
+        records = []
+        with open(path, 'rb') as f:
+            end = 0
+            for line in f:
+                # A crash can leave a partly written last line
+                if not line.endswith(b"\n"):
+                    logger.warning("Ignoring unfinished transcript line in %s", path)
+                    break
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.warning("Ignoring unreadable transcript line in %s", path)
+                    break
+                end += len(line)
+                records.append((end, record))
+            
+            # Each round node produces a Scientist/Philosopher pair, so a
+            # half-written pair is redone rather than continued
+            kept_arguments = sum(record["type"] == "argument" for _, record in records) // 2 * 2
+            
+            state = DebateState()
+            summarized_through = 0
+            kept_end = 0
+            for end, record in records:
+                kind = record.pop("type")
+                if kind == "topic":
+                    state.debate_id = record["debate_id"]
+                    state.topic = record["topic"]
+                    state.memory_summary = f"Debate Topic: {state.topic}"
+                elif kind == "argument":
+                    if len(state.arguments) == kept_arguments:
+                        break
+                    state.arguments.append(Argument(**record))
+                elif kind == "memory":
+                    state.memory_summary = record["summary"]
+                    summarized_through = record["round_num"]
+                kept_end = end
+            
+            f.seek(0)
+            kept = f.read(kept_end)
+        
+        if not state.topic:
+            raise ValueError(f"No debate topic found in {path}")
         
+        # New records are appended to this same file, so drop the torn line and
+        # any abandoned half pair first; otherwise the next record would be glued
+        # onto the fragment and a later resume would stop there
+        with open(path + ".tmp", 'wb') as f:
+            f.write(kept)
+        os.replace(path + ".tmp", path)
+        self._transcripts[state.debate_id] = path
+        
+        state.current_round = len(state.arguments) + 1
+        state.debate_complete = len(state.arguments) >= 8
+        
+        # Summaries trail the rounds, so the latest ones may have been in flight
+        # when the debate stopped. Redo them one round at a time, as the rounds
+        # would have, leaving the last one pending (the final round is never
+        # summarized)
+        summarize_until = len(state.arguments) - 2 if state.debate_complete else len(state.arguments)
+        for start in range(summarized_through, summarize_until, 2):
+            self._collect_memory(state)
+            self._submit_memory(state, state.arguments[start:start + 2])
+        
+        return self._execute(state)
+    
+    def _execute(self, initial_state: DebateState) -> DebateState:
+        """Run the graph for one interactive debate and save its log"""
         try:
-            final_state = self.graph.invoke(initial_state)
+            # LangGraph returns the final channel values as a dict
+            final_state = DebateState(**self.graph.invoke(initial_state))
             
             # Save final log
             self.save_debate_log(final_state)
+            self._log_cache_stats()
             
             return final_state
             
         except Exception as e:
-            logger.error(f"Error running debate: {e}")
+            logger.error("Error running debate: %s", e)
             print(f"Error running debate: {e}")
             raise
     
-    def save_debate_log(self, state: DebateState):
-        """Save complete debate log to file"""
+    def run_debate_batch(self, topics: List[str]) -> List[DebateState]:
+        """Run several debates concurrently without console streaming
+
+        Returns the debates that completed; failures are logged and skipped.
+        """
+        logger.info("Starting batch of %s debates...", len(topics))
+        
+        initial_states = [DebateState(topic=topic, verbose=False) for topic in topics]
+        
+        # Each debate runs its own copy of the graph; their LLM calls overlap.
+        # A failing debate comes back as its exception instead of discarding
+        # the others
+        results = self.graph.batch(initial_states, return_exceptions=True)
+        
+        final_states = []
+        for initial_state, result in zip(initial_states, results):
+            if isinstance(result, Exception):
+                logger.error("Error running debate on '%s': %s", initial_state.topic, result)
+                print(f"Error running debate on '{initial_state.topic}': {result}")
+                self._pending_memory.pop(initial_state.debate_id, None)
+                continue
+            final_states.append(DebateState(**result))
+        
+        # Batch logs are written compact; they are for tooling, not reading
+        for i, final_state in enumerate(final_states, start=1):
+            self.save_debate_log(final_state, f'debate_log_{i}.json', indent=False)
+        self._log_cache_stats()
+        
+        return final_states
+    
+    def _log_cache_stats(self):
+        """Log how many LLM calls the response cache answered"""
+        if self._cache:
+            logger.info("LLM cache stats: %s hits, %s misses", self._cache.hits, self._cache.misses)
+    
+    def save_debate_log(self, state: DebateState, path: str = 'debate_log.json', indent: bool = True):
+        """Save complete debate log to file, pretty-printed unless indent is False"""
         log_data = {
-            "timestamp": datetime.now().isoformat(),
-            "topic": state["topic"],
-            "arguments": state["arguments"],
-            "memory_summary": state["memory_summary"],
-            "full_summary": state["full_summary"],
-            "winner": state["winner"],
-            "judgment_reason": state["judgment_reason"]
+            "timestamp": _iso_now(),
+            "topic": state.topic,
+            "arguments": state.arguments,
+            "memory_summary": state.memory_summary,
+            "full_summary": state.full_summary,
+            "winner": state.winner,
+            "judgment_reason": state.judgment_reason
         }
         
-        with open('debate_log.json', 'w') as f:
-            json.dump(log_data, f, indent=2)
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(log_data, option=orjson.OPT_INDENT_2 if indent else None))
         
-        logger.info("Complete debate log saved to debate_log.json")
\ No newline at end of file
+        logger.info("Complete debate log saved to %s", path)
\ No newline at end of file
@@ -1,27 +1,103 @@
-from debate import DebateSystem
+import argparse
+import logging
+import logging.handlers
 import os
-from debate import logger
+
+from debate import DebateSystem, logger
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Scientist vs Philosopher debate")
+    parser.add_argument(
+        "topics",
+        nargs="*",
+        help="debate topic(s); several topics run as a concurrent batch "
+             "(default: $DEBATE_TOPIC, else prompt)"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="PATH",
+        help="continue an interrupted debate from its debate_<id>.jsonl transcript"
+    )
+    parser.add_argument(
+        "--draw-dag",
+        action="store_true",
+        help="render the workflow diagram to debate_workflow.png (needs network access)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always call the model instead of replaying responses from .llm_cache"
+    )
+    args = parser.parse_args()
+    
+    # A resumed debate already has its topic
+    if args.resume and args.topics:
+        parser.error("--resume cannot be combined with topics")
+    return args
 
 def main():
     """Main function to run the debate system"""
+    args = parse_args()
+    
+    # Configure logging to file (no console output); done by the entry point
+    # so importing debate.py never touches the log file
+    if not logging.getLogger().handlers:
+        file_handler = logging.FileHandler('debate_log.txt')
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        # Records reach the file in batches of 100 instead of one write each;
+        # errors flush straight away and the rest is flushed at exit
+        logging.basicConfig(
+            level=logging.INFO,
+            handlers=[
+                logging.handlers.MemoryHandler(100, flushLevel=logging.ERROR, target=file_handler)
+            ]
+        )
+    
     # Get API key from environment or user input
     api_key = os.getenv('GOOGLE_API_KEY')
     if not api_key:
         api_key = input("Enter your Google API key: ").strip()
     
+    # Topics come from the command line, then the environment; with neither,
+    # the debate prompts for one. Several topics run as one concurrent batch.
+    topics = args.topics
+    if not topics and not args.resume and os.getenv('DEBATE_TOPIC'):
+        topics = [os.getenv('DEBATE_TOPIC')]
+    
     try:
-        debate_system = DebateSystem(api_key)
-        final_state = debate_system.run_debate()
+        debate_system = DebateSystem(api_key, use_cache=not args.no_cache)
+        
+        # Rendering calls out to mermaid.ink, so it only runs on request
+        if args.draw_dag:
+            debate_system.show_workflow_diagram()
+            print("\n")
+        
+        if len(topics) > 1:
+            final_states = debate_system.run_debate_batch(topics)
+            
+            print("\n" + "="*50)
+            print(f"{len(final_states)} OF {len(topics)} DEBATES COMPLETE!")
+            print("="*50)
+            for i, final_state in enumerate(final_states, start=1):
+                print(f"[{i}] {final_state.topic} -> Winner: {final_state.winner}")
+            print(f"Check 'debate_log.txt' and 'debate_log_<n>.json' for full logs.")
+            return
+        
+        if args.resume:
+            final_state = debate_system.resume_debate(args.resume)
+        else:
+            final_state = debate_system.run_debate(topics[0] if topics else None)
         
         print("\n" + "="*50)
         print("DEBATE COMPLETE!")
         print("="*50)
-        print(f"Winner: {final_state['winner']}")
-        print(f"Check 'debate_log.txt' and 'complete_debate_log.json' for full logs.")
+        print(f"Winner: {final_state.winner}")
+        print(f"Check 'debate_log.txt' and 'debate_log.json' for full logs.")
         
     except Exception as e:
         print(f"Error: {e}")
-        logger.error(f"System error: {e}")
+        logger.error("System error: %s", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
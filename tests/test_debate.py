@@ -0,0 +1,171 @@
+import contextlib
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from typing import Any, List
+from unittest import mock
+
+import orjson
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+import debate
+
+
+class StubChatModel(BaseChatModel):
+    """Offline stand-in for ChatGoogleGenerativeAI with prompt-determined replies"""
+    model: str = "models/stub"
+    temperature: float = 0.7
+    calls: List[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(text.split())
+
+    def _reply(self, messages: List[Any], generation_config: Any = None) -> str:
+        prompt = "\n".join(m.content for m in messages)
+        self.calls.append(prompt)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+        properties = ((generation_config or {}).get("response_schema") or {}).get("properties", {})
+        if "argument" in properties:
+            return orjson.dumps({"argument": f"Point {digest}"}).decode()
+        if "winner" in properties:
+            return orjson.dumps({
+                "summary": f"Summary {digest}",
+                "winner": "Scientist",
+                "reason": "Stronger evidence."
+            }).decode()
+        return f"Memory {digest}"
+
+    def _generate(self, messages, stop=None, run_manager=None, generation_config=None, **kwargs):
+        content = self._reply(messages, generation_config)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages, stop=None, run_manager=None, generation_config=None, **kwargs):
+        content = self._reply(messages, generation_config)
+        for i in range(0, len(content), 4):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[i:i + 4]))
+
+
+def _stub_client(**kwargs) -> StubChatModel:
+    return StubChatModel(temperature=kwargs.get("temperature", 0.7))
+
+
+def _read_transcript(path: str) -> List[dict]:
+    with open(path, 'rb') as f:
+        return [orjson.loads(line) for line in f]
+
+
+class DebateTestCase(unittest.TestCase):
+    """Runs each test in a scratch directory with the stub model"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        patcher = mock.patch.object(debate, "ChatGoogleGenerativeAI", _stub_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def run_quietly(self, fn, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+
+
+class FullDebateTest(DebateTestCase):
+
+    def test_debate_has_eight_arguments_and_a_judgment(self):
+        system = debate.DebateSystem("key")
+        state = self.run_quietly(system.run_debate, "Should AI be regulated?")
+
+        self.assertEqual([arg["round_num"] for arg in state.arguments], list(range(1, 9)))
+        self.assertEqual([arg["agent"] for arg in state.arguments[:2]], ["Scientist", "Philosopher"])
+        self.assertEqual(state.winner, "Scientist")
+        self.assertTrue(state.full_summary)
+
+        records = _read_transcript(system.transcript_path(state))
+        self.assertEqual(records[0]["type"], "topic")
+        self.assertEqual(records[-1]["type"], "judgment")
+        # Every round but the last is summarized, in order
+        self.assertEqual([r["round_num"] for r in records if r["type"] == "memory"], [2, 4, 6])
+        self.assertTrue(os.path.exists("debate_log.json"))
+
+
+class ResumeTest(DebateTestCase):
+
+    def test_resume_after_crash_mid_pair(self):
+        system = debate.DebateSystem("key", use_cache=False)
+        finished = self.run_quietly(system.run_debate, "Is space exploration worth it?")
+        original = system.transcript_path(finished)
+        with open(original, 'rb') as f:
+            lines = f.readlines()
+        os.remove(original)
+
+        # Crash after the Scientist's round 5 argument: the summaries of rounds
+        # 2 and 4 were never recorded and the last line is half written
+        kept, arguments = [], 0
+        for line in lines:
+            record = orjson.loads(line)
+            if record["type"] == "memory":
+                continue
+            if record["type"] == "argument":
+                arguments += 1
+                if arguments > 5:
+                    break
+            kept.append(line)
+        os.mkdir("logs")
+        path = os.path.join("logs", "crashed.jsonl")
+        with open(path, 'wb') as f:
+            f.write(b"".join(kept) + b'{"type": "argu')
+
+        resumed_system = debate.DebateSystem("key", use_cache=False)
+        state = self.run_quietly(resumed_system.resume_debate, path)
+
+        self.assertEqual([arg["round_num"] for arg in state.arguments], list(range(1, 9)))
+        self.assertEqual(state.winner, "Scientist")
+
+        # The torn line and the abandoned round 5 are gone, the missing
+        # summaries are redone, and everything stayed in the given file
+        records = _read_transcript(path)
+        rounds = [r["round_num"] for r in records if r["type"] == "argument"]
+        self.assertEqual(rounds, list(range(1, 9)))
+        self.assertEqual([r["round_num"] for r in records if r["type"] == "memory"], [2, 4, 6])
+        self.assertEqual(records[-1]["type"], "judgment")
+        self.assertFalse(os.path.exists(f"debate_{state.debate_id}.jsonl"))
+
+        # Resuming the finished file again reads back the whole debate
+        again = self.run_quietly(debate.DebateSystem("key", use_cache=False).resume_debate, path)
+        self.assertEqual(len(again.arguments), 8)
+
+
+
+class CacheReplayTest(DebateTestCase):
+
+    def test_warm_cache_replays_without_model_calls(self):
+        topic = "Should cities ban cars?"
+        cold = debate.DebateSystem("key")
+        first = self.run_quietly(cold.run_debate, topic)
+        self.assertTrue(cold.llm.calls)
+
+        for _ in range(3):
+            warm = debate.DebateSystem("key")
+            replay = self.run_quietly(warm.run_debate, topic)
+            self.assertEqual(warm.llm.calls, [])
+            self.assertEqual(replay.arguments, first.arguments)
+            self.assertEqual(replay.winner, first.winner)
+            self.assertEqual(replay.full_summary, first.full_summary)
+
+
+if __name__ == "__main__":
+    unittest.main()